@@ -0,0 +1 @@
+"""GitHub activity → Telegram notifications"""
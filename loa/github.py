@@ -0,0 +1,391 @@
+"""GitHub events: rendering, de-duplication and polling of the Events API"""
+import asyncio
+import logging
+import re
+from collections import deque
+from datetime import datetime
+from functools import lru_cache
+from pathlib import Path
+from typing import Deque, Dict, Optional, Set
+
+import aiohttp
+import orjson
+
+from loa.http import request_with_retry
+from loa.telegram import Notification, TelegramClient, create_inline_buttons, send_notifications
+
+logger = logging.getLogger(__name__)
+
+# Pushes elsewhere are low priority; the Events API doesn't say which branch is default
+DEFAULT_BRANCHES = {"main", "master"}
+
+# Recently delivered event IDs, bounded so memory stays flat; saved across restarts.
+# Each ingest mode has its own file: Events API IDs and webhook delivery GUIDs never overlap.
+SEEN_FILE = Path.home() / ".loa" / "seen.json"
+SEEN_IDS: Set[str] = set()
+SEEN_QUEUE: Deque[str] = deque(maxlen=1024)
+
+# False until we have a baseline, either restored from disk or taken silently on the first poll
+baseline_taken = False
+
+# Conditional polling: GitHub answers 304 without charging rate limit when nothing changed
+events_etag: Optional[str] = None
+POLL_INTERVAL = 120  # seconds between polls until GitHub sends X-Poll-Interval
+poll_interval = POLL_INTERVAL
+
+def mark_seen(event_id: str) -> bool:
+    """Remember an event ID, returns False if it was already delivered"""
+    if event_id in SEEN_IDS:
+        return False
+    
+    # Forget the oldest ID before the deque silently drops it
+    if len(SEEN_QUEUE) == SEEN_QUEUE.maxlen:
+        SEEN_IDS.discard(SEEN_QUEUE[0])
+    
+    SEEN_QUEUE.append(event_id)
+    SEEN_IDS.add(event_id)
+    return True
+
+def load_seen_ids(path: Path = SEEN_FILE) -> None:
+    """Restore delivered event IDs from the previous run"""
+    global baseline_taken
+    
+    try:
+        event_ids = orjson.loads(path.read_bytes())
+    except FileNotFoundError:
+        return
+    except (OSError, ValueError) as e:
+        logger.warning(f"Could not read {path}: {e}")
+        return
+    
+    for event_id in event_ids:
+        mark_seen(event_id)
+    
+    baseline_taken = bool(event_ids)
+
+def save_seen_ids(path: Path = SEEN_FILE) -> None:
+    """Persist delivered event IDs so a restart doesn't replay them"""
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(orjson.dumps(list(SEEN_QUEUE)))
+    except OSError as e:
+        logger.error(f"Could not write {path}: {e}")
+
+@lru_cache(maxsize=512)
+def format_datetime(iso_string: str) -> str:
+    """Format datetime to readable format"""
+    try:
+        dt = datetime.fromisoformat(iso_string.replace('Z', '+00:00'))
+        return dt.strftime('%m/%d %H:%M')
+    except ValueError:
+        return "unknown"
+
+# Commit keywords matched in one scan; each group name is a key of COMMIT_EMOJIS
+COMMIT_KEYWORDS = re.compile(
+    r"(?P<fix>fix|bug|patch)"
+    r"|(?P<feat>feat|add|new)"
+    r"|(?P<perf>update|improve|enhance)"
+    r"|(?P<docs>docs|readme)"
+    r"|(?P<style>style|format)"
+    r"|(?P<test>test)"
+    r"|(?P<refactor>refactor|clean)",
+    re.IGNORECASE
+)
+
+COMMIT_EMOJIS = {
+    'fix': '🐛',
+    'feat': '✨',
+    'perf': '⚡',
+    'docs': '📚',
+    'style': '💄',
+    'test': '🧪',
+    'refactor': '♻️'
+}
+
+def get_commit_emoji(message: str) -> str:
+    """Get emoji based on commit message"""
+    # Conventional commits ("feat:", "fix(scope):") need just a dict lookup
+    prefix, colon, _ = message.partition(':')
+    if colon:
+        emoji = COMMIT_EMOJIS.get(prefix.partition('(')[0].strip().rstrip('!').lower())
+        if emoji:
+            return emoji
+    
+    match = COMMIT_KEYWORDS.search(message)
+    return COMMIT_EMOJIS[match.lastgroup] if match else '📝'
+
+# Message layouts, filled in with str.format_map
+PUSH_TMPL = """🚀 <b>{repo_short}</b> • <code>{branch}</code>
+
+<blockquote>
+{commits_text}
+</blockquote>
+
+<i>🕐 {time_formatted} • {commit_count} commit{plural}</i>"""
+
+PR_TMPL = """{action_emoji} <b>PR {action}</b> • <b>{repo_short}</b>
+
+<blockquote>
+<b>{title}</b>
+<i>by @{author}</i>{description}
+</blockquote>
+
+<i>🕐 {time_formatted}</i>"""
+
+FORK_TMPL = """🍴 <b>Fork Created</b>
+
+<blockquote>
+<b>{repo_short}</b> → <b>{fork_name}</b>
+<i>by @{owner}</i>
+</blockquote>
+
+<i>🕐 {time_formatted}</i>"""
+
+STAR_TMPL = """⭐ <b>New Star!</b>
+
+<blockquote>
+<b>{repo_short}</b>
+<i>starred by @{actor}</i>
+</blockquote>
+
+<i>🕐 {time_formatted}</i>"""
+
+RELEASE_TMPL = """🎉 <b>New Release!</b>
+
+<blockquote>
+<b>{repo_short}</b> <code>{tag_name}</code>
+<b>{name}</b>
+</blockquote>
+
+<i>🕐 {time_formatted}</i>"""
+
+STARTUP_TMPL = """🚀 <b>GitHub Monitor Active!</b>
+
+<blockquote>
+👤 <b>Watching:</b> <code>{username}</code>
+🕐 <b>Started:</b> <code>{started}</code>
+</blockquote>
+
+<i>🔔 Ready to notify you about new activities!</i>"""
+
+# Action emoji mapping
+PR_ACTION_EMOJIS = {
+    'opened': '📤',
+    'closed': '🔒',
+    'merged': '🎉',
+    'reopened': '🔄',
+    'edited': '✏️'
+}
+
+def process_push_event(event: Dict) -> Notification:
+    """Process GitHub push event with beautiful formatting"""
+    repo = event["repo"]["name"]
+    time_formatted = format_datetime(event["created_at"])
+    
+    commits = event["payload"].get("commits", [])
+    branch = event["payload"].get("ref", "").replace("refs/heads/", "")
+    
+    # Beautiful header
+    repo_short = repo.rpartition('/')[2]  # Just repo name, not username/repo
+    
+    if commits:
+        commit_count = len(commits)
+        commits_preview = []
+        
+        for commit in commits[:3]:
+            message = commit["message"].partition('\n')[0]
+            message = message[:45] + "…" if len(message) > 45 else message
+            
+            emoji = get_commit_emoji(message)
+            commits_preview.append(f"{emoji} {message}")
+        
+        commits_text = '\n'.join(commits_preview)
+        if commit_count > 3:
+            commits_text += f"\n<i>... and {commit_count - 3} more</i>"
+    else:
+        commits_text = "📝 <i>No details available</i>"
+        commit_count = 0
+    
+    # Create beautiful message with blockquote
+    text = PUSH_TMPL.format_map({
+        "repo_short": repo_short,
+        "branch": branch,
+        "commits_text": commits_text,
+        "time_formatted": time_formatted,
+        "commit_count": commit_count,
+        "plural": "" if commit_count == 1 else "s"
+    })
+    
+    # Webhook payloads carry the default branch, Events API ones don't
+    default_branch = event["payload"].get("repository", {}).get("default_branch")
+    on_default_branch = branch == default_branch if default_branch else branch in DEFAULT_BRANCHES
+    
+    buttons = create_inline_buttons(repo)
+    return Notification(repo, text, buttons, silent=commit_count == 0 or not on_default_branch)
+
+def process_pull_request_event(event: Dict) -> Notification:
+    """Process GitHub pull request event with beautiful formatting"""
+    repo = event["repo"]["name"]
+    time_formatted = format_datetime(event["created_at"])
+    
+    pr = event["payload"]["pull_request"]
+    action = event["payload"]["action"]
+    
+    repo_short = repo.rpartition('/')[2]
+    
+    # PR title truncation
+    title = pr['title'][:60] + "…" if len(pr['title']) > 60 else pr['title']
+    
+    body = pr.get('body')
+    if body:
+        description = "\n\n💬 " + (body[:80] + "…" if len(body) > 80 else body)
+    else:
+        description = ""
+    
+    text = PR_TMPL.format_map({
+        "action_emoji": PR_ACTION_EMOJIS.get(action, '📋'),
+        "action": action.title(),
+        "repo_short": repo_short,
+        "title": title,
+        "author": pr['user']['login'],
+        "description": description,
+        "time_formatted": time_formatted
+    })
+    
+    buttons = create_inline_buttons(repo, pr['html_url'])
+    return Notification(repo, text, buttons, details_url=pr['html_url'])
+
+def process_fork_event(event: Dict) -> Notification:
+    """Process GitHub fork event with beautiful formatting"""
+    repo = event["repo"]["name"]
+    time_formatted = format_datetime(event["created_at"])
+    
+    forkee = event["payload"]["forkee"]
+    
+    repo_short = repo.rpartition('/')[2]
+    fork_name = forkee['full_name'].rpartition('/')[2]
+    
+    text = FORK_TMPL.format_map({
+        "repo_short": repo_short,
+        "fork_name": fork_name,
+        "owner": forkee['owner']['login'],
+        "time_formatted": time_formatted
+    })
+    
+    buttons = create_inline_buttons(repo, forkee['html_url'])
+    return Notification(repo, text, buttons, silent=True, details_url=forkee['html_url'])
+
+def process_star_event(event: Dict) -> Notification:
+    """Process GitHub star event"""
+    repo = event["repo"]["name"]
+    time_formatted = format_datetime(event["created_at"])
+    
+    repo_short = repo.rpartition('/')[2]
+    
+    text = STAR_TMPL.format_map({
+        "repo_short": repo_short,
+        "actor": event['actor']['login'],
+        "time_formatted": time_formatted
+    })
+    
+    buttons = create_inline_buttons(repo)
+    return Notification(repo, text, buttons, silent=True)
+
+def process_release_event(event: Dict) -> Notification:
+    """Process GitHub release event"""
+    repo = event["repo"]["name"]
+    time_formatted = format_datetime(event["created_at"])
+    
+    release = event["payload"]["release"]
+    repo_short = repo.rpartition('/')[2]
+    
+    text = RELEASE_TMPL.format_map({
+        "repo_short": repo_short,
+        "tag_name": release['tag_name'],
+        "name": release['name'],
+        "time_formatted": time_formatted
+    })
+    
+    buttons = create_inline_buttons(repo, release['html_url'])
+    return Notification(repo, text, buttons, details_url=release['html_url'])
+
+async def send_startup_message(telegram: TelegramClient, username: str) -> None:
+    """Announce that the monitor is up"""
+    startup_msg = STARTUP_TMPL.format_map({
+        "username": username,
+        "started": datetime.now().strftime('%m/%d %H:%M')
+    })
+    
+    await telegram.send(startup_msg)
+
+# Event types we notify about; everything else is skipped silently
+HANDLERS = {
+    "PushEvent": process_push_event,
+    "PullRequestEvent": process_pull_request_event,
+    "ForkEvent": process_fork_event,
+    "WatchEvent": process_star_event,
+    "ReleaseEvent": process_release_event,
+}
+
+def render_event(event: Dict) -> Optional[Notification]:
+    """Route an event to its processor"""
+    handler = HANDLERS.get(event["type"])
+    return handler(event) if handler else None
+
+async def fetch_github_events(session: aiohttp.ClientSession, telegram: TelegramClient, username: str) -> None:
+    """Fetch and process GitHub events"""
+    global events_etag, poll_interval, baseline_taken
+    
+    url = f"https://api.github.com/users/{username}/events"
+    headers = {"If-None-Match": events_etag} if events_etag else {}
+    
+    try:
+        response = await request_with_retry(session, "GET", url, "GitHub events", headers=headers)
+        async with response:
+            # GitHub tells pollers how often they may ask
+            poll_interval = int(response.headers.get("X-Poll-Interval", poll_interval))
+            
+            if response.status == 304:
+                return
+            
+            response.raise_for_status()
+            events_etag = response.headers.get("ETag")
+            events = orjson.loads(await response.read())
+        
+        # ANTI-SPAM: On the very first run, remember the whole page without processing
+        if not baseline_taken:
+            for event in reversed(events):
+                mark_seen(event["id"])
+            baseline_taken = True
+            print("🤖 Bot started - monitoring GitHub activity...")
+            return
+        
+        # Collect unseen events we notify about, in chronological order, so the
+        # anti-spam cap only counts real notifications
+        new_events = [event for event in reversed(events) if event["type"] in HANDLERS and mark_seen(event["id"])]
+        
+        if not new_events:
+            return
+            
+        # ANTI-SPAM: Limit to the latest 3 events per check
+        if len(new_events) > 3:
+            print(f"⚠️ Limited to 3 events (had {len(new_events)} new)")
+            new_events = new_events[-3:]
+        
+        notifications = [render_event(event) for event in new_events]
+        await send_notifications(telegram, notifications)
+        
+        print(f"✅ Processed {len(new_events)} events")
+    
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        logger.error(f"GitHub API error: {e or type(e).__name__}")
+    except Exception as e:
+        logger.error(f"Unexpected error: {e}")
+
+async def run_polling(session: aiohttp.ClientSession, telegram: TelegramClient, username: str) -> None:
+    """Poll the public events API at the interval GitHub asks for"""
+    print(f"🔄 Checking every {poll_interval} seconds...")
+    
+    while True:
+        await fetch_github_events(session, telegram, username)
+        await asyncio.sleep(poll_interval)
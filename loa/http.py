@@ -0,0 +1,47 @@
+"""HTTP helpers shared by the Telegram and GitHub clients"""
+import asyncio
+import logging
+from typing import Optional
+
+import aiohttp
+
+logger = logging.getLogger(__name__)
+
+# Same policy as urllib3's Retry(total=5, backoff_factor=0.5, status_forcelist=[...])
+MAX_RETRIES = 5
+BACKOFF_FACTOR = 0.5
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+def retry_after(response: aiohttp.ClientResponse) -> Optional[float]:
+    """Seconds the server asked us to wait, if it said so"""
+    try:
+        return float(response.headers["Retry-After"])
+    except (KeyError, ValueError):
+        return None
+
+async def request_with_retry(session: aiohttp.ClientSession, method: str, url: str, label: str, **kwargs) -> aiohttp.ClientResponse:
+    """Send a request, retrying 429/5xx and connection errors with exponential backoff
+
+    Only `label` is logged, never `url`: Telegram URLs embed the bot token.
+    """
+    for attempt in range(MAX_RETRIES + 1):
+        backoff = BACKOFF_FACTOR * 2 ** attempt
+        
+        try:
+            response = await session.request(method, url, **kwargs)
+        except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+            if attempt == MAX_RETRIES:
+                raise
+            delay = backoff
+            reason = str(e) or type(e).__name__
+        else:
+            if response.status not in RETRY_STATUSES or attempt == MAX_RETRIES:
+                return response
+            
+            # Rate limits tell us exactly how long to wait
+            delay = retry_after(response) or backoff
+            reason = f"HTTP {response.status}"
+            response.release()
+        
+        logger.warning(f"{label} failed ({reason}), retrying in {delay:.1f}s")
+        await asyncio.sleep(delay)
@@ -0,0 +1,130 @@
+"""Telegram delivery: the chat client and batching of rendered events"""
+import asyncio
+import logging
+from functools import lru_cache
+from typing import Dict, List, NamedTuple, Optional
+
+import aiohttp
+import orjson
+
+from loa.http import request_with_retry
+
+logger = logging.getLogger(__name__)
+
+JSON_HEADERS = {"Content-Type": "application/json"}  # bodies are pre-encoded with orjson
+
+# Events found in one poll are sent together, split only at Telegram's size limit
+TELEGRAM_MAX_LENGTH = 4096
+BATCH_SEPARATOR = "\n\n─────\n\n"
+
+class Notification(NamedTuple):
+    """A rendered event, sent on its own or batched with others"""
+    repo: str
+    text: str
+    buttons: Dict
+    silent: bool = False  # delivered without sound/vibration
+    details_url: Optional[str] = None  # PR/release/fork page, kept when batching
+
+class TelegramClient:
+    """Sends messages to one Telegram chat over a shared HTTP session"""
+    __slots__ = ("session", "api_url", "chat_id", "_base", "_send_slots")
+    
+    def __init__(self, session: aiohttp.ClientSession, token: str, chat_id: str):
+        self.session = session
+        self.api_url = f"https://api.telegram.org/bot{token}/sendMessage"
+        self.chat_id = chat_id
+        
+        # Fields shared by every sendMessage call; only text and reply_markup vary
+        self._base = {
+            "chat_id": chat_id,
+            "parse_mode": "HTML",
+            "disable_web_page_preview": True
+        }
+        
+        # Telegram throttles bursts to the same chat, so cap concurrent sends.
+        # Built here, inside the running loop: before 3.10 a semaphore binds to the loop current at creation.
+        self._send_slots = asyncio.Semaphore(3)
+    
+    async def send(self, text: str, buttons: Optional[Dict] = None, silent: bool = False) -> bool:
+        """Send enhanced message to Telegram"""
+        try:
+            payload = {**self._base, "text": text}
+            
+            if buttons:
+                payload["reply_markup"] = buttons
+            
+            if silent:
+                payload["disable_notification"] = True
+            
+            async with self._send_slots:
+                response = await request_with_retry(self.session, "POST", self.api_url, "Telegram sendMessage", data=orjson.dumps(payload), headers=JSON_HEADERS)
+                async with response:
+                    response.raise_for_status()
+            return True
+            
+        except aiohttp.ClientResponseError as e:
+            # str(e) includes the request URL, and with it the bot token
+            logger.error(f"Telegram send failed: HTTP {e.status} {e.message}")
+            return False
+        except Exception as e:
+            logger.error(f"Telegram send failed: {e}")
+            return False
+
+@lru_cache(maxsize=512)
+def create_inline_buttons(repo_name: str, additional_url: Optional[str] = None) -> Dict:
+    """Create beautiful inline keyboard (cached, so never mutate the result)"""
+    repo_url = f"https://github.com/{repo_name}"
+    
+    keyboard = [[{"text": "🔗 View Repo", "url": repo_url}]]
+    
+    if additional_url:
+        keyboard.append([{"text": "📋 Details", "url": additional_url}])
+    
+    return {"inline_keyboard": keyboard}
+
+def create_batch_buttons(notifications: List[Notification]) -> Dict:
+    """One row per distinct repo/details link in a batch"""
+    links = dict.fromkeys((notification.repo, notification.details_url) for notification in notifications)
+    
+    keyboard = []
+    for repo, details_url in links:
+        row = [{"text": f"🔗 {repo.rpartition('/')[2]}", "url": f"https://github.com/{repo}"}]
+        
+        if details_url:
+            row.append({"text": "📋 Details", "url": details_url})
+        
+        keyboard.append(row)
+    
+    return {"inline_keyboard": keyboard}
+
+def join_in_chunks(texts: List[str]) -> List[str]:
+    """Join texts with a separator into chunks that each fit one message"""
+    chunks = []
+    current = ""
+    
+    for text in texts:
+        if current and len(current) + len(BATCH_SEPARATOR) + len(text) > TELEGRAM_MAX_LENGTH:
+            chunks.append(current)
+            current = text
+        else:
+            current = f"{current}{BATCH_SEPARATOR}{text}" if current else text
+    
+    chunks.append(current)
+    return chunks
+
+async def send_notifications(telegram: TelegramClient, notifications: List[Notification]) -> None:
+    """Send notifications as a single Telegram message"""
+    if len(notifications) == 1:
+        buttons = notifications[0].buttons
+    else:
+        buttons = create_batch_buttons(notifications)
+    
+    # One important event is enough to make the whole batch ring
+    silent = all(notification.silent for notification in notifications)
+    
+    chunks = join_in_chunks([notification.text for notification in notifications])
+    
+    # Chunks go out in order, with the keyboard under the last one
+    for chunk in chunks[:-1]:
+        await telegram.send(chunk, silent=silent)
+    await telegram.send(chunks[-1], buttons=buttons, silent=silent)
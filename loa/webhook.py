@@ -0,0 +1,121 @@
+"""Webhook receiver: GitHub pushes events to us instead of being polled"""
+import asyncio
+import hashlib
+import hmac
+import logging
+from datetime import datetime, timezone
+from typing import Dict, Optional, Set
+
+import orjson
+from aiohttp import web
+
+from loa.github import SEEN_FILE, mark_seen, render_event
+from loa.telegram import TelegramClient, send_notifications
+
+logger = logging.getLogger(__name__)
+
+# Webhook event names mapped to the Events API types the processors understand
+WEBHOOK_EVENT_TYPES = {
+    "push": "PushEvent",
+    "pull_request": "PullRequestEvent",
+    "fork": "ForkEvent",
+    "watch": "WatchEvent",
+    "release": "ReleaseEvent",
+}
+
+# Deliveries still being sent; the loop only keeps weak references to tasks
+pending_deliveries: Set[asyncio.Task] = set()
+
+# Delivery GUIDs are kept apart from the poller's Events API IDs
+WEBHOOK_SEEN_FILE = SEEN_FILE.with_name("webhook-seen.json")
+
+# Pull requests fire for every label, review request, push etc.; only announce these
+PR_ACTIONS = {"opened", "closed", "reopened"}
+
+def verify_signature(body: bytes, signature: Optional[str], secret: str) -> bool:
+    """Check the X-Hub-Signature-256 header against our webhook secret"""
+    if not signature or not signature.startswith("sha256="):
+        return False
+    
+    expected = hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+    return hmac.compare_digest(expected, signature[len("sha256="):])
+
+def webhook_to_event(event_type: str, delivery_id: str, payload: Dict) -> Dict:
+    """Wrap a webhook payload in the Events API shape used by the processors"""
+    return {
+        "id": delivery_id,
+        "type": event_type,
+        "repo": {"name": payload["repository"]["full_name"]},
+        "actor": {"login": payload["sender"]["login"]},
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "payload": payload
+    }
+
+async def handle_github_webhook(request: web.Request) -> web.Response:
+    """Receive a GitHub webhook delivery and dispatch it"""
+    body = await request.read()
+    
+    if not verify_signature(body, request.headers.get("X-Hub-Signature-256"), request.app["secret"]):
+        return web.Response(status=401)
+    
+    # Acknowledge ping and unsupported events without doing anything
+    event_type = WEBHOOK_EVENT_TYPES.get(request.headers.get("X-GitHub-Event", ""))
+    if event_type is None:
+        return web.Response(status=204)
+    
+    try:
+        payload = orjson.loads(body)
+    except ValueError:
+        return web.Response(status=400)
+    
+    # Releases fire for drafts and edits too; only announce published ones
+    if event_type == "ReleaseEvent" and payload.get("action") != "published":
+        return web.Response(status=204)
+    
+    if event_type == "PullRequestEvent" and payload.get("action") not in PR_ACTIONS:
+        return web.Response(status=204)
+    
+    # Pushes also fire for branch deletions and tags, which the Events API never showed
+    if event_type == "PushEvent" and (payload.get("deleted") or not payload.get("ref", "").startswith("refs/heads/")):
+        return web.Response(status=204)
+    
+    # Redelivered webhooks keep their delivery ID
+    delivery_id = request.headers.get("X-GitHub-Delivery", "")
+    if delivery_id and not mark_seen(delivery_id):
+        return web.Response(status=204)
+    
+    event = webhook_to_event(event_type, delivery_id, payload)
+    
+    try:
+        notification = render_event(event)
+    except Exception as e:
+        logger.error(f"Webhook dispatch failed: {e}")
+        return web.Response(status=204)
+    
+    # Telegram retries can outlast GitHub's 10 s delivery timeout, so answer right away
+    if notification:
+        task = asyncio.create_task(send_notifications(request.app["telegram"], [notification]))
+        pending_deliveries.add(task)
+        task.add_done_callback(pending_deliveries.discard)
+    
+    return web.Response(status=204)
+
+async def run_webhook_server(telegram: TelegramClient, secret: str, port: int) -> None:
+    """Serve GitHub webhooks until cancelled"""
+    app = web.Application()
+    app["telegram"] = telegram
+    app["secret"] = secret
+    app.router.add_post("/webhook/github", handle_github_webhook)
+    
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, port=port).start()
+    
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await runner.cleanup()
+        
+        # Give in-flight sends a moment to finish before the session closes
+        if pending_deliveries:
+            await asyncio.wait(pending_deliveries, timeout=10)